@@ -16,8 +16,6 @@ from tempfile import NamedTemporaryFile
 
 import pytest
 from botocore.credentials import Credentials
-from s3transfer.futures import NonThreadedExecutor
-from s3transfer.manager import TransferManager
 
 from boto3.exceptions import RetriesExceededError, S3UploadFailedError
 from boto3.s3.transfer import (
@@ -33,104 +31,87 @@ from boto3.s3.transfer import (
 )
 from tests import mock, unittest
 
+CREDENTIALS = Credentials('access', 'secret', 'token')
+TRANSFER_CONFIG_KWARGS = {
+    'multipart_threshold': 8 * MB,
+    'max_concurrency': 10,
+    'multipart_chunksize': 8 * MB,
+    'num_download_attempts': 5,
+    'max_io_queue': 100,
+    'io_chunksize': 256 * KB,
+    'use_threads': True,
+    'max_bandwidth': 1024 * KB,
+    'preferred_transfer_client': "classic",
+}
+TRANSFER_CONFIG = TransferConfig(**TRANSFER_CONFIG_KWARGS)
+
 
 def create_mock_client(region_name='us-west-2'):
     client = mock.Mock()
     client.meta.region_name = region_name
-    client._get_credentials.return_value = Credentials(
-        'access', 'secret', 'token'
-    )
+    client._get_credentials.return_value = CREDENTIALS
     return client
 
 
+@mock.patch('boto3.s3.transfer.TransferManager')
 class TestCreateTransferManager(unittest.TestCase):
-    def test_create_transfer_manager(self):
+    def test_create_transfer_manager(self, manager):
         client = create_mock_client()
         config = TransferConfig(preferred_transfer_client="classic")
         osutil = OSUtils()
-        with mock.patch('boto3.s3.transfer.TransferManager') as manager:
-            create_transfer_manager(client, config, osutil)
-            assert manager.call_args == mock.call(client, config, osutil, None)
+        create_transfer_manager(client, config, osutil)
+        assert manager.call_args == mock.call(client, config, osutil, None)
+
+    def test_create_transfer_manager_with_no_threads(self, manager):
+        from s3transfer.futures import NonThreadedExecutor
 
-    def test_create_transfer_manager_with_no_threads(self):
         client = create_mock_client()
         config = TransferConfig(preferred_transfer_client="classic")
         config.use_threads = False
-        with mock.patch('boto3.s3.transfer.TransferManager') as manager:
-            create_transfer_manager(client, config)
-            assert manager.call_args == mock.call(
-                client, config, None, NonThreadedExecutor
-            )
+        create_transfer_manager(client, config)
+        assert manager.call_args == mock.call(
+            client, config, None, NonThreadedExecutor
+        )
 
-    def test_create_transfer_manager_with_default_config(self):
+    @mock.patch('boto3.s3.transfer.HAS_CRT', False)
+    def test_create_transfer_manager_with_default_config(self, manager):
         """Ensure we still default to classic transfer manager when CRT
         is disabled.
         """
-        with mock.patch('boto3.s3.transfer.HAS_CRT', False):
-            client = create_mock_client()
-            config = TransferConfig()
-            assert config.preferred_transfer_client == "auto"
-            with mock.patch('boto3.s3.transfer.TransferManager') as manager:
-                create_transfer_manager(client, config)
-                assert manager.call_args == mock.call(
-                    client, config, None, None
-                )
-
-
-class TestTransferConfig(unittest.TestCase):
-    def assert_value_of_actual_and_alias(
-        self, config, actual, alias, ref_value
-    ):
+        client = create_mock_client()
+        config = TransferConfig()
+        assert config.preferred_transfer_client == "auto"
+        create_transfer_manager(client, config)
+        assert manager.call_args == mock.call(client, config, None, None)
+
+
+class TestTransferConfig:
+    @pytest.mark.parametrize(
+        'alias,actual',
+        (
+            ('max_concurrency', 'max_request_concurrency'),
+            ('max_io_queue', 'max_io_queue_size'),
+        ),
+    )
+    def test_alias(self, alias, actual):
+        ref_value = 10
+        config = TransferConfig(**{alias: ref_value})
         # Ensure that the name set in the underlying TransferConfig (i.e.
         # the actual) is the correct value.
         assert getattr(config, actual) == ref_value
         # Ensure that backcompat name (i.e. the alias) is the correct value.
         assert getattr(config, alias) == ref_value
 
-    def test_alias_max_concurreny(self):
-        ref_value = 10
-        config = TransferConfig(max_concurrency=ref_value)
-        self.assert_value_of_actual_and_alias(
-            config, 'max_request_concurrency', 'max_concurrency', ref_value
-        )
-
-        # Set a new value using the alias
-        new_value = 15
-        config.max_concurrency = new_value
-        # Make sure it sets the value for both the alias and the actual
-        # value that will be used in the TransferManager
-        self.assert_value_of_actual_and_alias(
-            config, 'max_request_concurrency', 'max_concurrency', new_value
-        )
-
-    def test_alias_max_io_queue(self):
-        ref_value = 10
-        config = TransferConfig(max_io_queue=ref_value)
-        self.assert_value_of_actual_and_alias(
-            config, 'max_io_queue_size', 'max_io_queue', ref_value
-        )
-
         # Set a new value using the alias
         new_value = 15
-        config.max_io_queue = new_value
+        setattr(config, alias, new_value)
         # Make sure it sets the value for both the alias and the actual
         # value that will be used in the TransferManager
-        self.assert_value_of_actual_and_alias(
-            config, 'max_io_queue_size', 'max_io_queue', new_value
-        )
+        assert getattr(config, actual) == new_value
+        assert getattr(config, alias) == new_value
 
     def test_transferconfig_parameters(self):
-        config = TransferConfig(
-            multipart_threshold=8 * MB,
-            max_concurrency=10,
-            multipart_chunksize=8 * MB,
-            num_download_attempts=5,
-            max_io_queue=100,
-            io_chunksize=256 * KB,
-            use_threads=True,
-            max_bandwidth=1024 * KB,
-            preferred_transfer_client="classic",
-        )
+        config = TransferConfig(**TRANSFER_CONFIG_KWARGS)
         assert config.multipart_threshold == 8 * MB
         assert config.multipart_chunksize == 8 * MB
         assert config.max_request_concurrency == 10
@@ -142,17 +123,7 @@ class TestTransferConfig(unittest.TestCase):
         assert config.preferred_transfer_client == "classic"
 
     def test_transferconfig_copy(self):
-        config = TransferConfig(
-            multipart_threshold=8 * MB,
-            max_concurrency=10,
-            multipart_chunksize=8 * MB,
-            num_download_attempts=5,
-            max_io_queue=100,
-            io_chunksize=256 * KB,
-            use_threads=True,
-            max_bandwidth=1024 * KB,
-            preferred_transfer_client="classic",
-        )
+        config = TRANSFER_CONFIG
         copied_config = copy.copy(config)
 
         assert config is not copied_config
@@ -183,17 +154,32 @@ class TestProgressCallbackInvoker(unittest.TestCase):
         callback.assert_called_with(1)
 
 
-class TestS3Transfer(unittest.TestCase):
-    def setUp(self):
-        self.client = create_mock_client()
-        self.manager = mock.Mock(TransferManager(self.client))
-        self.transfer = S3Transfer(manager=self.manager)
-        self.callback = mock.Mock()
+class TestS3Transfer:
+    @classmethod
+    def setup_class(cls):
+        from s3transfer.manager import TransferManager
+
         # Use NamedTempFile as source of a path string that is valid and
         # realistic for the system the tests are run on. The file gets deleted
         # immediately and will not actually exist while the tests are run.
+        # The path is only ever used as a string, so it is shared across
+        # all of the tests in the class.
         with NamedTemporaryFile("w") as tmp_file:
-            self.file_path_str = tmp_file.name
+            cls.file_path_str = tmp_file.name
+        # Building the client and manager mocks is relatively expensive, so
+        # they are created once and reset before each test.
+        cls._client = create_mock_client()
+        cls._manager = mock.create_autospec(TransferManager, instance=True)
+
+    def setup_method(self):
+        self.client = self._client
+        self.client.reset_mock()
+        self.manager = self._manager
+        # Also reset return values and side effects as some tests
+        # configure the futures returned by the manager.
+        self.manager.reset_mock(return_value=True, side_effect=True)
+        self.transfer = S3Transfer(manager=self.manager)
+        self.callback = mock.Mock()
 
     def assert_callback_wrapped_in_subscriber(self, call_args):
         subscribers = call_args[0][4]
@@ -207,31 +193,11 @@ class TestS3Transfer(unittest.TestCase):
         subscriber.on_progress(bytes_transferred=1)
         self.callback.assert_called_with(1)
 
-    def test_upload_file(self):
-        extra_args = {'ACL': 'public-read'}
-        self.transfer.upload_file(
-            'smallfile', 'bucket', 'key', extra_args=extra_args
-        )
-        self.manager.upload.assert_called_with(
-            'smallfile', 'bucket', 'key', extra_args, None
-        )
-
-    def test_upload_file_via_path(self):
-        extra_args = {'ACL': 'public-read'}
-        self.transfer.upload_file(
-            pathlib.Path(self.file_path_str),
-            'bucket',
-            'key',
-            extra_args=extra_args,
-        )
-        self.manager.upload.assert_called_with(
-            self.file_path_str, 'bucket', 'key', extra_args, None
-        )
-
-    def test_upload_file_via_purepath(self):
+    @pytest.mark.parametrize('path_cls', (str, pathlib.Path, pathlib.PurePath))
+    def test_upload_file(self, path_cls):
         extra_args = {'ACL': 'public-read'}
         self.transfer.upload_file(
-            pathlib.PurePath(self.file_path_str),
+            path_cls(self.file_path_str),
             'bucket',
             'key',
             extra_args=extra_args,
@@ -240,19 +206,8 @@ class TestS3Transfer(unittest.TestCase):
             self.file_path_str, 'bucket', 'key', extra_args, None
         )
 
-    def test_download_file(self):
-        extra_args = {
-            'SSECustomerKey': 'foo',
-            'SSECustomerAlgorithm': 'AES256',
-        }
-        self.transfer.download_file(
-            'bucket', 'key', self.file_path_str, extra_args=extra_args
-        )
-        self.manager.download.assert_called_with(
-            'bucket', 'key', self.file_path_str, extra_args, None
-        )
-
-    def test_download_file_via_path(self):
+    @pytest.mark.parametrize('path_cls', (str, pathlib.Path, pathlib.PurePath))
+    def test_download_file(self, path_cls):
         extra_args = {
             'SSECustomerKey': 'foo',
             'SSECustomerAlgorithm': 'AES256',
@@ -260,15 +215,11 @@ class TestS3Transfer(unittest.TestCase):
         self.transfer.download_file(
             'bucket',
             'key',
-            pathlib.Path(self.file_path_str),
+            path_cls(self.file_path_str),
             extra_args=extra_args,
         )
         self.manager.download.assert_called_with(
-            'bucket',
-            'key',
-            self.file_path_str,
-            extra_args,
-            None,
+            'bucket', 'key', self.file_path_str, extra_args, None
         )
 
     def test_upload_wraps_callback(self):
@@ -340,23 +291,19 @@ class TestS3Transfer(unittest.TestCase):
             transfer.download_file(bucket='foo', key='bar', filename=object())
 
     def test_context_manager(self):
-        manager = mock.Mock()
-        manager.__exit__ = mock.Mock()
-        with S3Transfer(manager=manager):
+        with S3Transfer(manager=self.manager):
             pass
         # The underlying transfer manager should have had its __exit__
         # called as well.
-        assert manager.__exit__.call_args == mock.call(None, None, None)
+        assert self.manager.__exit__.call_args == mock.call(None, None, None)
 
     def test_context_manager_with_errors(self):
-        manager = mock.Mock()
-        manager.__exit__ = mock.Mock()
         raised_exception = ValueError()
         with pytest.raises(type(raised_exception)):
-            with S3Transfer(manager=manager):
+            with S3Transfer(manager=self.manager):
                 raise raised_exception
         # The underlying transfer manager should have had its __exit__
         # called as well and pass on the error as well.
-        assert manager.__exit__.call_args == mock.call(
+        assert self.manager.__exit__.call_args == mock.call(
             type(raised_exception), raised_exception, mock.ANY
         )